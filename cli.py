@@ -5,6 +5,8 @@ Command-line interface for MongoDB WiredTiger Browser.
 
 import click
 import sys
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
 from wt_browser import WiredTigerBrowser
 
@@ -18,6 +20,58 @@ def cli():
     pass
 
 
+def _export_tables(browser, tables, output_path, format, limit, workers, on_exported=None):
+    """
+    Export every table with a progress bar, reporting failures as they occur.
+    
+    on_exported is called with the output file of each table once its
+    export is complete.
+    """
+    with click.progressbar(length=len(tables), label="Exporting tables") as bar:
+        def on_complete(table, output_file, error):
+            bar.update(1)
+            if error is not None:
+                click.echo(f"  ✗ Failed to export '{table}': {error}", err=True)
+            elif on_exported is not None:
+                on_exported(output_file)
+        
+        browser.export_all_tables(output_path, format, limit, workers,
+                                  tables=tables, on_complete=on_complete)
+
+
+def _record_progressbar(label, total=None):
+    """
+    Return a progress bar for exported records.
+    
+    Without a total, the bar shows how many records have been exported so far.
+    """
+    if total:
+        return click.progressbar(length=total, label=label)
+    
+    def unknown_length():
+        # A generator has no length hint, so click leaves the length unknown
+        return
+        yield
+    
+    return click.progressbar(unknown_length(), label=label, show_pos=True)
+
+
+@contextmanager
+def _zstd_archive(archive_path):
+    """Open a tar archive that is compressed with Zstandard as it is written."""
+    # Imported here so that only --compress pays for loading them
+    import tarfile
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("--compress zstd requires the zstandard package")
+    
+    compressor = zstandard.ZstdCompressor(level=3, threads=-1)
+    with open(archive_path, 'wb') as f, compressor.stream_writer(f) as writer:
+        with tarfile.open(fileobj=writer, mode='w|') as tar:
+            yield tar
+
+
 @cli.command()
 @click.argument('db_path', type=click.Path(exists=True))
 def list_tables(db_path):
@@ -62,7 +116,8 @@ def info(db_path, table_name):
             click.echo(f"Exists: {table_info['exists']}")
             
             if table_info['exists']:
-                click.echo(f"Record Count: {table_info['record_count']}")
+                approx = " (approximate)" if table_info.get('record_count_approx') else ""
+                click.echo(f"Record Count: {table_info['record_count']}{approx}")
                 
                 if table_info.get('config'):
                     click.echo(f"\nConfiguration:")
@@ -82,20 +137,25 @@ def info(db_path, table_name):
 @click.argument('db_path', type=click.Path(exists=True))
 @click.argument('table_name')
 @click.argument('output_file', type=click.Path())
-@click.option('--format', '-f', type=click.Choice(['json', 'csv']), default='json',
+@click.option('--format', '-f', type=click.Choice(['json', 'jsonl', 'csv', 'raw']), default='json',
               help='Output format (default: json)')
 @click.option('--limit', '-l', type=int, default=None,
               help='Limit number of records to export')
-def export(db_path, table_name, output_file, format, limit):
+@click.option('--decode-bson', is_flag=True,
+              help='Export BSON document values as Extended JSON (requires python-bsonjs)')
+@click.option('--binary-encoding', type=click.Choice(['hex', 'base64']), default='hex',
+              help='Encoding of binary values (default: hex); base64 values start with "b64:"')
+def export(db_path, table_name, output_file, format, limit, decode_bson, binary_encoding):
     """
-    Export a table to JSON or CSV format.
+    Export a table to JSON, JSON Lines, CSV or raw binary format.
     
     DB_PATH: Path to the WiredTiger database directory
     TABLE_NAME: Name of the table to export
     OUTPUT_FILE: Path to the output file
     """
     try:
-        with WiredTigerBrowser(db_path) as browser:
+        with WiredTigerBrowser(db_path, decode_bson=decode_bson,
+                               binary_encoding=binary_encoding) as browser:
             # Check if table exists
             tables = browser.list_tables()
             if table_name not in tables:
@@ -105,11 +165,10 @@ def export(db_path, table_name, output_file, format, limit):
                     click.echo(f"  • {t}", err=True)
                 sys.exit(1)
             
-            # Export based on format
-            if format == 'json':
-                browser.export_table_to_json(table_name, output_file, limit)
-            elif format == 'csv':
-                browser.export_table_to_csv(table_name, output_file, limit)
+            # Counting the records would walk the whole table before the
+            # export reads it again, so only a limit gives the bar a total
+            with _record_progressbar(f"Exporting {table_name}", limit) as bar:
+                browser.export_table(table_name, output_file, format, limit, progress=bar.update)
             
             click.echo(f"✓ Export completed successfully!")
     
@@ -121,11 +180,20 @@ def export(db_path, table_name, output_file, format, limit):
 @cli.command()
 @click.argument('db_path', type=click.Path(exists=True))
 @click.argument('output_dir', type=click.Path())
-@click.option('--format', '-f', type=click.Choice(['json', 'csv']), default='json',
+@click.option('--format', '-f', type=click.Choice(['json', 'jsonl', 'csv', 'raw']), default='json',
               help='Output format (default: json)')
 @click.option('--limit', '-l', type=int, default=None,
               help='Limit number of records per table')
-def export_all(db_path, output_dir, format, limit):
+@click.option('--workers', '-j', type=int, default=None,
+              help='Number of tables to export concurrently (default: number of CPUs)')
+@click.option('--decode-bson', is_flag=True,
+              help='Export BSON document values as Extended JSON (requires python-bsonjs)')
+@click.option('--binary-encoding', type=click.Choice(['hex', 'base64']), default='hex',
+              help='Encoding of binary values (default: hex); base64 values start with "b64:"')
+@click.option('--compress', type=click.Choice(['zstd']), default=None,
+              help='Write all tables to a single compressed archive in OUTPUT_DIR')
+def export_all(db_path, output_dir, format, limit, workers, decode_bson, binary_encoding,
+               compress):
     """
     Export all tables to the specified directory.
     
@@ -136,7 +204,8 @@ def export_all(db_path, output_dir, format, limit):
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         
-        with WiredTigerBrowser(db_path) as browser:
+        with WiredTigerBrowser(db_path, decode_bson=decode_bson,
+                               binary_encoding=binary_encoding) as browser:
             tables = browser.list_tables()
             
             if not tables:
@@ -146,17 +215,23 @@ def export_all(db_path, output_dir, format, limit):
             click.echo(f"\nExporting {len(tables)} table(s) to {output_dir}...")
             click.echo("-" * 50)
             
-            for table in tables:
-                ext = 'json' if format == 'json' else 'csv'
-                output_file = output_path / f"{table}.{ext}"
+            if compress == 'zstd':
+                # Tar members need their size up front, so tables are staged
+                # on disk and moved into the archive as each one finishes.
+                archive_path = output_path / f"{Path(db_path).resolve().name}.tar.zst"
+                with _zstd_archive(archive_path) as tar, \
+                        tempfile.TemporaryDirectory(dir=output_path) as staging_dir:
+                    def add_to_archive(output_file):
+                        tar.add(output_file, arcname=output_file.name)
+                        output_file.unlink()
+                    
+                    _export_tables(browser, tables, staging_dir, format, limit, workers,
+                                   on_exported=add_to_archive)
                 
-                try:
-                    if format == 'json':
-                        browser.export_table_to_json(table, str(output_file), limit)
-                    elif format == 'csv':
-                        browser.export_table_to_csv(table, str(output_file), limit)
-                except Exception as e:
-                    click.echo(f"  ✗ Failed to export '{table}': {e}", err=True)
+                click.echo(f"\n✓ All tables exported to {archive_path}")
+                return
+            
+            _export_tables(browser, tables, output_path, format, limit, workers)
             
             click.echo(f"\n✓ All tables exported to {output_dir}")
     
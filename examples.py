@@ -86,13 +86,13 @@ def example_export_all():
             
             print(f"\nExporting {len(tables)} tables to {output_dir}...")
             
-            for table in tables:
-                output_file = output_dir / f"{table}.json"
-                try:
-                    browser.export_table_to_json(table, str(output_file), limit=100)
+            # Tables are exported concurrently; failures do not stop the rest
+            results = browser.export_all_tables(str(output_dir), limit=100)
+            for table, error in results.items():
+                if error is None:
                     print(f"  ✓ Exported {table}")
-                except Exception as e:
-                    print(f"  ✗ Failed to export {table}: {e}")
+                else:
+                    print(f"  ✗ Failed to export {table}: {error}")
     
     except FileNotFoundError:
         print(f"\nNote: This is just an example. Database path does not exist.")
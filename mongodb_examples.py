@@ -169,22 +169,17 @@ def migrate_backup_to_json(backup_path: str, output_dir: str):
             
             print(f"Found {len(collections)} collection(s) to export\n")
             
-            exported = 0
-            failed = 0
+            def report(collection, output_file, error):
+                if error is None:
+                    print(f"✓ {collection} -> {output_file}")
+                else:
+                    print(f"✗ {collection} failed: {error}")
             
-            for collection in collections:
-                try:
-                    output_file = output_path / f"{collection}.json"
-                    info = browser.get_table_info(collection)
-                    
-                    print(f"Exporting {collection} ({info['record_count']} records)...", end=" ")
-                    browser.export_table_to_json(collection, str(output_file))
-                    print("✓")
-                    exported += 1
-                    
-                except Exception as e:
-                    print(f"✗ Failed: {e}")
-                    failed += 1
+            # Collections are independent, so export them concurrently.
+            results = browser.export_all_tables(output_path, tables=collections,
+                                                on_complete=report)
+            failed = sum(error is not None for error in results.values())
+            exported = len(results) - failed
             
             print("\n" + "-" * 70)
             print(f"Migration complete: {exported} succeeded, {failed} failed")
@@ -21,7 +21,12 @@ setup(
     install_requires=[
         'wiredtiger>=11.2.0',
         'click>=8.1.7',
+        'orjson>=3.9.0',
     ],
+    extras_require={
+        'bson': ['python-bsonjs>=0.3.0'],
+        'zstd': ['zstandard>=0.21.0'],
+    },
     entry_points={
         'console_scripts': [
             'mongodb-wt-browser=cli:cli',
@@ -4,12 +4,63 @@ Test script for MongoDB WiredTiger Browser
 Demonstrates all functionality with a test database.
 """
 
+import csv
+import io
+import json
+import struct
 import sys
-import subprocess
+import tarfile
 import tempfile
 from pathlib import Path
 import wiredtiger
 import shutil
+from click.testing import CliRunner
+from cli import cli
+from wt_browser import BATCH_SIZE
+
+
+USERS = {
+    1: '{"name": "Alice", "age": 30}',
+    2: '{"name": "Bob", "age": 25}',
+    3: '{"name": "Charlie", "age": 35}',
+}
+
+PRODUCTS = {
+    "prod-001": '{"name": "Laptop", "price": 999.99}',
+    "prod-002": '{"name": "Mouse", "price": 29.99}',
+    "prod-003": '{"name": "Keyboard", "price": 79.99}',
+    "prod-004": '{"name": "Monitor", "price": 299.99}',
+}
+
+LOGS = {i: f'log entry {i}' for i in range(1, 11)}
+
+# Values that need quoting in CSV exports
+NOTES = {
+    "note-1": 'plain text',
+    "note-2": 'a, b and c',
+    "note-3": 'she said "hi"',
+    "note-4": 'first line\r\nsecond line',
+}
+
+# Names stored as BSON documents
+DOCUMENT_NAMES = ["Alice", "Bob"]
+
+# Number of records in each table
+TABLE_SIZES = {
+    "users": len(USERS),
+    "products": len(PRODUCTS),
+    "logs": len(LOGS),
+    "notes": len(NOTES),
+    "documents": len(DOCUMENT_NAMES),
+    "events": 2 * BATCH_SIZE,
+}
+
+
+def bson_document(name):
+    """Encode {"name": name} as a BSON document."""
+    value = name.encode('utf-8') + b'\x00'
+    element = b'\x02name\x00' + struct.pack('<i', len(value)) + value
+    return struct.pack('<i', len(element) + 5) + element + b'\x00'
 
 
 def create_test_database():
@@ -38,29 +89,50 @@ def create_test_database():
     # Table 1: Users
     session.create("table:users", "key_format=i,value_format=S")
     cursor = session.open_cursor("table:users")
-    cursor[1] = '{"name": "Alice", "age": 30}'
-    cursor[2] = '{"name": "Bob", "age": 25}'
-    cursor[3] = '{"name": "Charlie", "age": 35}'
+    for key, value in USERS.items():
+        cursor[key] = value
     cursor.close()
-    print("  ✓ Created 'users' table with 3 records")
+    print(f"  ✓ Created 'users' table with {len(USERS)} records")
     
     # Table 2: Products
     session.create("table:products", "key_format=S,value_format=S")
     cursor = session.open_cursor("table:products")
-    cursor["prod-001"] = '{"name": "Laptop", "price": 999.99}'
-    cursor["prod-002"] = '{"name": "Mouse", "price": 29.99}'
-    cursor["prod-003"] = '{"name": "Keyboard", "price": 79.99}'
-    cursor["prod-004"] = '{"name": "Monitor", "price": 299.99}'
+    for key, value in PRODUCTS.items():
+        cursor[key] = value
     cursor.close()
-    print("  ✓ Created 'products' table with 4 records")
+    print(f"  ✓ Created 'products' table with {len(PRODUCTS)} records")
     
     # Table 3: Logs
     session.create("table:logs", "key_format=i,value_format=S")
     cursor = session.open_cursor("table:logs")
-    for i in range(1, 11):
-        cursor[i] = f'log entry {i}'
+    for key, value in LOGS.items():
+        cursor[key] = value
     cursor.close()
-    print("  ✓ Created 'logs' table with 10 records")
+    print(f"  ✓ Created 'logs' table with {len(LOGS)} records")
+    
+    # Table 4: Notes with characters that need quoting in CSV
+    session.create("table:notes", "key_format=S,value_format=S")
+    cursor = session.open_cursor("table:notes")
+    for key, value in NOTES.items():
+        cursor[key] = value
+    cursor.close()
+    print(f"  ✓ Created 'notes' table with {len(NOTES)} records")
+    
+    # Table 5: Documents stored as BSON, like a MongoDB collection
+    session.create("table:documents", "key_format=q,value_format=u")
+    cursor = session.open_cursor("table:documents")
+    for i, name in enumerate(DOCUMENT_NAMES, 1):
+        cursor[i] = bson_document(name)
+    cursor.close()
+    print(f"  ✓ Created 'documents' table with {len(DOCUMENT_NAMES)} BSON records")
+    
+    # Table 6: Events filling exactly two export batches
+    session.create("table:events", "key_format=i,value_format=S")
+    cursor = session.open_cursor("table:events")
+    for i in range(1, TABLE_SIZES["events"] + 1):
+        cursor[i] = f'event {i}'
+    cursor.close()
+    print(f"  ✓ Created 'events' table with {TABLE_SIZES['events']} records")
     
     session.close()
     conn.close()
@@ -69,20 +141,25 @@ def create_test_database():
     return test_db
 
 
-def run_command(cmd, description):
-    """Run a CLI command and display results."""
+def run_command(args, description):
+    """Run a CLI command in-process and display results."""
     print("\n" + "=" * 60)
     print(description)
     print("=" * 60)
-    print(f"Command: {' '.join(cmd)}")
+    print(f"Command: cli.py {' '.join(args)}")
     print("-" * 60)
     
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    print(result.stdout)
-    if result.stderr:
-        print("STDERR:", result.stderr, file=sys.stderr)
+    result = CliRunner().invoke(cli, args)
+    print(result.output)
+    if result.exception and not isinstance(result.exception, SystemExit):
+        print("ERROR:", repr(result.exception), file=sys.stderr)
     
-    return result.returncode
+    return result.exit_code
+
+
+def expected_records(values, limit=None):
+    """Return stored values as exported [key, value] pairs, keys as text."""
+    return [[str(key), value] for key, value in values.items()][:limit]
 
 
 def main():
@@ -96,13 +173,13 @@ def main():
     
     # Test 1: List tables
     run_command(
-        ["python3", "cli.py", "list-tables", str(test_db)],
+        ["list-tables", str(test_db)],
         "Test 1: List All Tables"
     )
     
     # Test 2: Get table info
     run_command(
-        ["python3", "cli.py", "info", str(test_db), "users"],
+        ["info", str(test_db), "users"],
         "Test 2: Get Table Information"
     )
     
@@ -111,8 +188,8 @@ def main():
     output_dir = temp_dir / "test_output"
     output_dir.mkdir(exist_ok=True)
     
-    run_command(
-        ["python3", "cli.py", "export", str(test_db), "users", 
+    exit_code = run_command(
+        ["export", str(test_db), "users", 
          str(output_dir / "users.json")],
         "Test 3: Export Single Table to JSON"
     )
@@ -121,11 +198,16 @@ def main():
     print("\nExported JSON content:")
     print("-" * 60)
     with open(output_dir / "users.json") as f:
-        print(f.read())
+        content = f.read()
+    print(content)
+    exported = json.loads(content)
+    records = [[record["key"], record["value"]] for record in exported["records"]]
+    if exit_code != 0 or records != expected_records(USERS) or exported["record_count"] != len(USERS):
+        raise RuntimeError("JSON export does not contain the stored records")
     
     # Test 4: Export to CSV
-    run_command(
-        ["python3", "cli.py", "export", str(test_db), "products", 
+    exit_code = run_command(
+        ["export", str(test_db), "products", 
          str(output_dir / "products.csv"), "--format", "csv"],
         "Test 4: Export Single Table to CSV"
     )
@@ -133,37 +215,179 @@ def main():
     # Display exported CSV
     print("\nExported CSV content:")
     print("-" * 60)
-    with open(output_dir / "products.csv") as f:
-        print(f.read())
+    with open(output_dir / "products.csv", newline='') as f:
+        content = f.read()
+    print(content)
+    if exit_code != 0 or list(csv.reader(io.StringIO(content))) != [["key", "value"]] + expected_records(PRODUCTS):
+        raise RuntimeError("CSV export does not contain the stored records")
     
     # Test 5: Export with limit
-    run_command(
-        ["python3", "cli.py", "export", str(test_db), "logs", 
+    exit_code = run_command(
+        ["export", str(test_db), "logs", 
          str(output_dir / "logs_limited.json"), "--limit", "5"],
         "Test 5: Export with Record Limit"
     )
     
+    with open(output_dir / "logs_limited.json") as f:
+        exported = json.load(f)
+    records = [[record["key"], record["value"]] for record in exported["records"]]
+    if exit_code != 0 or records != expected_records(LOGS, 5) or exported["record_count"] != 5:
+        raise RuntimeError("Limited export does not contain the first 5 records")
+    
     # Test 6: Export all tables
     export_all_dir = output_dir / "all_tables"
-    run_command(
-        ["python3", "cli.py", "export-all", str(test_db), str(export_all_dir)],
+    exit_code = run_command(
+        ["export-all", str(test_db), str(export_all_dir)],
         "Test 6: Export All Tables"
     )
     
     # List exported files
     print("\nExported files:")
     print("-" * 60)
+    record_counts = {}
     for file in sorted(export_all_dir.glob("*")):
         print(f"  • {file.name} ({file.stat().st_size} bytes)")
+        with open(file) as f:
+            record_counts[file.stem] = json.load(f)["record_count"]
+    if exit_code != 0 or record_counts != TABLE_SIZES:
+        raise RuntimeError("Export of all tables does not contain every table's records")
     
     # Test 7: Export all to CSV
     export_csv_dir = output_dir / "all_tables_csv"
-    run_command(
-        ["python3", "cli.py", "export-all", str(test_db), str(export_csv_dir),
+    exit_code = run_command(
+        ["export-all", str(test_db), str(export_csv_dir),
          "--format", "csv", "--limit", "5"],
         "Test 7: Export All Tables to CSV with Limit"
     )
     
+    row_counts = {}
+    for file in export_csv_dir.glob("*.csv"):
+        with open(file, newline='') as f:
+            row_counts[file.stem] = sum(1 for _ in csv.reader(f)) - 1
+    if exit_code != 0 or row_counts != {table: min(size, 5) for table, size in TABLE_SIZES.items()}:
+        raise RuntimeError("CSV export of all tables does not contain 5 records per table")
+    
+    # Test 8: Export to JSON Lines
+    exit_code = run_command(
+        ["export", str(test_db), "logs",
+         str(output_dir / "logs.jsonl"), "--format", "jsonl"],
+        "Test 8: Export Single Table to JSON Lines"
+    )
+    
+    # Display exported JSON Lines
+    print("\nExported JSON Lines content:")
+    print("-" * 60)
+    with open(output_dir / "logs.jsonl") as f:
+        content = f.read()
+    print(content)
+    records = [[record["key"], record["value"]] for record in map(json.loads, content.splitlines())]
+    if exit_code != 0 or records != expected_records(LOGS):
+        raise RuntimeError("JSON Lines export does not contain the stored records")
+    
+    # Test 9: Export values that need quoting to CSV
+    exit_code = run_command(
+        ["export", str(test_db), "notes",
+         str(output_dir / "notes.csv"), "--format", "csv"],
+        "Test 9: Export Values with Commas, Quotes and Line Breaks to CSV"
+    )
+    
+    # Read the CSV back and compare it with the stored values
+    with open(output_dir / "notes.csv", newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    print("\nCSV rows read back:")
+    print("-" * 60)
+    for row in rows:
+        print(f"  {row!r}")
+    if exit_code != 0 or rows != [["key", "value"]] + expected_records(NOTES):
+        raise RuntimeError("CSV export does not round-trip the stored values")
+    
+    # Test 10: Export to raw binary format
+    exit_code = run_command(
+        ["export", str(test_db), "documents",
+         str(output_dir / "documents.raw"), "--format", "raw"],
+        "Test 10: Export Single Table to Raw Binary Format"
+    )
+    
+    # Read the records back as described in the README
+    print("\nRaw records read back:")
+    print("-" * 60)
+    raw_records = []
+    with open(output_dir / "documents.raw", 'rb') as f:
+        while header := f.read(4):
+            key = f.read(struct.unpack('<I', header)[0])
+            value = f.read(struct.unpack('<I', f.read(4))[0])
+            raw_records.append((key, value))
+            print(f"  {key!r}: {value!r}")
+    if exit_code != 0 or [value for _, value in raw_records] != list(map(bson_document, DOCUMENT_NAMES)):
+        raise RuntimeError("Raw export does not contain the stored values")
+    
+    # Test 11: Export all tables to a compressed archive
+    try:
+        import zstandard
+    except ImportError:
+        zstandard = None
+    
+    if zstandard is None:
+        print("\nTest 11: Skipped (--compress zstd requires the zstandard package)")
+    else:
+        archive_dir = output_dir / "archive"
+        exit_code = run_command(
+            ["export-all", str(test_db), str(archive_dir), "--compress", "zstd"],
+            "Test 11: Export All Tables to a Zstandard Archive"
+        )
+        
+        # List the archive members
+        print("\nArchive members:")
+        print("-" * 60)
+        members = []
+        with open(archive_dir / f"{test_db.name}.tar.zst", 'rb') as f:
+            reader = zstandard.ZstdDecompressor().stream_reader(f)
+            with tarfile.open(fileobj=reader, mode='r|') as tar:
+                for member in tar:
+                    print(f"  • {member.name} ({member.size} bytes)")
+                    members.append(member.name)
+        if exit_code != 0 or sorted(members) != sorted(f"{table}.json" for table in TABLE_SIZES):
+            raise RuntimeError("Archive does not contain an export of every table")
+    
+    # Test 12: Export BSON documents as Extended JSON
+    try:
+        import bsonjs
+    except ImportError:
+        bsonjs = None
+    
+    if bsonjs is None:
+        print("\nTest 12: Skipped (--decode-bson requires the python-bsonjs package)")
+    else:
+        exit_code = run_command(
+            ["export", str(test_db), "documents",
+             str(output_dir / "documents.jsonl"), "--format", "jsonl", "--decode-bson"],
+            "Test 12: Export BSON Documents as Extended JSON"
+        )
+        
+        # Display exported JSON Lines
+        print("\nExported JSON Lines content:")
+        print("-" * 60)
+        with open(output_dir / "documents.jsonl") as f:
+            content = f.read()
+        print(content)
+        values = [json.loads(line)["value"] for line in content.splitlines()]
+        if exit_code != 0 or values != [{"name": name} for name in DOCUMENT_NAMES]:
+            raise RuntimeError("BSON export does not contain the stored documents")
+    
+    # Test 13: Export a table larger than one batch without a limit
+    exit_code = run_command(
+        ["export", str(test_db), "events",
+         str(output_dir / "events.jsonl"), "--format", "jsonl"],
+        "Test 13: Export Every Record of a Multi-Batch Table"
+    )
+    
+    # Every record should be exported exactly once
+    with open(output_dir / "events.jsonl") as f:
+        keys = [json.loads(line)["key"] for line in f]
+    print(f"\nExported {len(keys)} records")
+    if exit_code != 0 or keys != [str(i) for i in range(1, TABLE_SIZES["events"] + 1)]:
+        raise RuntimeError("Full export does not contain every record exactly once")
+    
     # Summary
     print("\n" + "=" * 60)
     print("Test Summary")
@@ -4,25 +4,388 @@ MongoDB WiredTiger Browser
 A tool to open MongoDB WiredTiger backups and export tables.
 """
 
+import base64
+import io
 import json
 import csv
+import os
+import queue
+import re
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing, contextmanager, nullcontext
+from functools import cached_property
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Iterator, Optional
 import wiredtiger
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+try:
+    import bsonjs
+except ImportError:  # pragma: no cover - bsonjs is optional
+    bsonjs = None
+
+
+# Size of the write buffer used for export files. Large exports issue many
+# small writes, so a generous buffer keeps the syscall count down.
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Number of records pulled from a cursor at a time during exports
+BATCH_SIZE = 4096
+
+# Amount of data the kernel is asked to read ahead of full table scans. It is
+# shared between the scans running at the same time, and larger files only
+# have their beginning read ahead, so the scans do not race the page cache
+# for memory.
+READAHEAD_SIZE = 1 << 30
+
+# Suffix of the temporary name full-table exports are written under until
+# they are complete
+PARTIAL_SUFFIX = ".partial"
+
+# Prefix of the metadata keys that describe tables
+TABLE_PREFIX = "table:"
+TABLE_PREFIX_LEN = len(TABLE_PREFIX)
+
+# Data file in the metadata of a table's column group, e.g. source="file:users.wt"
+_FILE_SOURCE = re.compile(r'(?:^|,)source="?file:([^",]+)')
+
+# Output formats supported by export_table()
+EXPORT_FORMATS = ("json", "jsonl", "csv", "raw")
+
+# Length prefix written before each key and value in raw exports
+_RAW_LENGTH = struct.Struct('<I')
+
+# Minimum number of records exported between two progress reports
+PROGRESS_INTERVAL = 10000
+
+# Maximum number of batches buffered between export pipeline stages. A full
+# queue blocks the stage feeding it, which bounds memory use.
+PIPELINE_DEPTH = 8
+
+# Number of leading bytes of a value inspected to decide whether it is text
+# or binary data. Binary formats such as BSON contain control characters
+# (e.g. NUL bytes in their length prefix) within the first few bytes.
+TEXT_SAMPLE_SIZE = 64
+
+# With the base64 binary encoding, binary values are exported with
+# BINARY_PREFIX. Text values starting with either prefix are exported with
+# TEXT_PREFIX added in front, so every exported value can be told apart.
+BINARY_PREFIX = "b64:"
+TEXT_PREFIX = "txt:"
+
+# Bytes that may appear in text: anything but the ASCII control characters,
+# apart from tab, line feed and carriage return
+_TEXT_BYTES = bytes(c for c in range(256) if c >= 0x20 or c in b'\t\n\r')
+
+# Read-only connection settings. Fast statistics allow record counts to be
+# gathered inside WiredTiger instead of by iterating over records in Python.
+CONNECTION_CONFIG = "readonly=true,statistics=(fast)"
+
+# Default connection tuning. The cache is sized well above WiredTiger's
+# 100MB default so that metadata and the pages of large scans are not
+# constantly evicted, with extra eviction threads to keep up during exports.
+DEFAULT_CACHE_SIZE = "2GB"
+DEFAULT_EVICTION_THREADS = 4
+
+# Default capacity of the on-disk chunk cache, when one is configured
+DEFAULT_CHUNK_CACHE_CAPACITY = "2GB"
+
+# Pre-fetching reads the next pages of a table in the background while the
+# current page is being processed. It is made available on the connection and
+# only enabled for the sessions that perform full table scans.
+PREFETCH_CONNECTION_CONFIG = "prefetch=(available=true,default=false)"
+PREFETCH_SESSION_CONFIG = "prefetch=(enabled=true)"
+
+# Statistics cursor configuration used to read a table's entry count. The
+# B-tree entry count is gathered by walking the tree's pages inside
+# WiredTiger, without returning any records to Python. The walk still reads
+# every page of the table, so its cost grows with the size of the table.
+RECORD_COUNT_STATISTICS_CONFIG = "statistics=(fast,tree_walk)"
+
+
+if orjson is not None:
+    def _dumps(obj: Any) -> bytes:
+        """Serialize an object to compact UTF-8 encoded JSON."""
+        return orjson.dumps(obj)
+else:
+    def _dumps(obj: Any) -> bytes:
+        """Serialize an object to compact UTF-8 encoded JSON."""
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _fetch_batch(cursor, n: int = BATCH_SIZE) -> List[List[Any]]:
+    """
+    Fetch up to n records from a cursor in a single call.
+    
+    Args:
+        cursor: WiredTiger cursor, or iterator over one, to read from
+        n: Maximum number of records to fetch
+        
+    Returns:
+        List of [key, value] pairs, shorter than n once the cursor is exhausted
+    """
+    return list(islice(cursor, n))
+
+
+def _packed_records(cursor) -> Iterator[List[bytes]]:
+    """
+    Iterate over the records of a cursor without unpacking them.
+    
+    The Python bindings iterate over a cursor by unpacking every key and
+    value according to the table's formats, so read the packed buffers
+    instead.
+    
+    Args:
+        cursor: WiredTiger cursor to read from
+        
+    Yields:
+        [key, value] pairs of packed bytes
+    """
+    while cursor.next() != wiredtiger.WT_NOTFOUND:
+        yield [cursor._get_key(), cursor._get_value()]
+
+
+def _pipeline(batches: Iterator[Any], encode: Callable[[Any], Any]) -> Iterator[Any]:
+    """
+    Yield encode(batch) for every batch, reading and encoding in the background.
+    
+    Batches are read on one thread and encoded on another while the caller
+    consumes the results, so reading, encoding and writing overlap instead of
+    running one after another. The stages are connected by bounded queues.
+    
+    Args:
+        batches: Iterator of batches to encode, consumed on a background thread
+        encode: Function applied to each batch on a background thread
+        
+    Yields:
+        Encoded batches, in order
+    """
+    done = object()
+    read_queue = queue.Queue(maxsize=PIPELINE_DEPTH)
+    encode_queue = queue.Queue(maxsize=PIPELINE_DEPTH)
+    stop = threading.Event()
+    errors = []
+    
+    def read():
+        try:
+            for batch in batches:
+                if stop.is_set():
+                    break
+                read_queue.put(batch)
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            batches.close()
+            read_queue.put(done)
+    
+    def encode_batches():
+        try:
+            while True:
+                batch = read_queue.get()
+                if batch is done:
+                    break
+                # After a failure, keep draining so the reader can finish
+                if not stop.is_set():
+                    encode_queue.put(encode(batch))
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+            while batch is not done:
+                batch = read_queue.get()
+        finally:
+            encode_queue.put(done)
+    
+    threads = [threading.Thread(target=read, daemon=True),
+               threading.Thread(target=encode_batches, daemon=True)]
+    for thread in threads:
+        thread.start()
+    
+    item = None
+    try:
+        while True:
+            item = encode_queue.get()
+            if item is done:
+                break
+            yield item
+    finally:
+        if item is not done:
+            # The consumer stopped early; unblock and wind down the stages
+            stop.set()
+            while item is not done:
+                item = encode_queue.get()
+        for thread in threads:
+            thread.join()
+    
+    if errors:
+        raise errors[0]
+
+
+def _with_progress(chunks: Iterator[Any], progress: Optional[Callable[[int], None]]) -> Iterator[Any]:
+    """
+    Pass (record count, data) chunks through, reporting progress as they go.
+    
+    Args:
+        chunks: Iterator of (record count, data) tuples
+        progress: Called with the number of records exported since the last
+            call, at most once every PROGRESS_INTERVAL records (None to disable)
+            
+    Yields:
+        The chunks, unchanged
+    """
+    # Closing this generator, e.g. because writing a chunk failed, closes
+    # the chunks it reads from as well
+    try:
+        if progress is None:
+            yield from chunks
+            return
+        
+        pending = 0
+        for n, data in chunks:
+            yield n, data
+            pending += n
+            if pending >= PROGRESS_INTERVAL:
+                progress(pending)
+                pending = 0
+        
+        if pending:
+            progress(pending)
+    finally:
+        chunks.close()
+
+
+def _bson_to_json(value: Any) -> Optional[str]:
+    """
+    Convert a BSON document to MongoDB relaxed Extended JSON.
+    
+    Args:
+        value: Raw value read from a table
+        
+    Returns:
+        The document as JSON text, or None if the value is not a BSON document
+    """
+    # A BSON document starts with its total length and ends with a NUL byte
+    if (not isinstance(value, (bytes, bytearray)) or len(value) < 5
+            or value[-1] != 0 or int.from_bytes(value[:4], 'little') != len(value)):
+        return None
+    
+    try:
+        return bsonjs.dumps(bytes(value))
+    except ValueError:
+        return None
+
+
+def _is_probably_text(value: bytes) -> bool:
+    """Return whether a value looks like text, judging by its first bytes."""
+    # Deleting every text byte leaves only the control characters, if any
+    return not value[:TEXT_SAMPLE_SIZE].translate(None, _TEXT_BYTES)
+
+
+def _decode_text(value: bytes) -> Optional[str]:
+    """Decode a value as UTF-8, or return None if it is binary data."""
+    # Values that start out binary are rejected without attempting a decode
+    if _is_probably_text(value):
+        try:
+            return value.decode('utf-8')
+        except UnicodeDecodeError:
+            pass
+    return None
+
+
+def _decode_bytes_hex(value: bytes) -> str:
+    """Decode a text value as UTF-8, or return the hex representation of binary data."""
+    text = _decode_text(value)
+    return value.hex() if text is None else text
+
+
+def _escape_text(text: str) -> str:
+    """Mark text that would otherwise read as a prefixed (base64) value."""
+    if text.startswith((BINARY_PREFIX, TEXT_PREFIX)):
+        return TEXT_PREFIX + text
+    return text
+
+
+def _decode_bytes_base64(value: bytes) -> str:
+    """Decode a text value as UTF-8, or encode binary data as prefixed base64."""
+    text = _decode_text(value)
+    if text is None:
+        return BINARY_PREFIX + base64.b64encode(value).decode('ascii')
+    return _escape_text(text)
+
+
+# Supported encodings of binary values, each mapped to the functions that
+# convert binary values and text values
+BINARY_ENCODINGS = {
+    "hex": (_decode_bytes_hex, str),
+    "base64": (_decode_bytes_base64, _escape_text),
+}
+
 
 class WiredTigerBrowser:
     """Browser for MongoDB WiredTiger database files."""
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, decode_bson: bool = False,
+                 cache_size: str = DEFAULT_CACHE_SIZE,
+                 eviction_threads: int = DEFAULT_EVICTION_THREADS,
+                 session_max: Optional[int] = None,
+                 chunk_cache_path: Optional[str] = None,
+                 chunk_cache_capacity: str = DEFAULT_CHUNK_CACHE_CAPACITY,
+                 binary_encoding: str = "hex"):
         """
         Initialize the WiredTiger browser.
         
         Args:
             db_path: Path to the WiredTiger database directory
+            decode_bson: Export BSON document values as Extended JSON
+                (requires the python-bsonjs package)
+            cache_size: Maximum size of the WiredTiger cache, e.g. "4GB"
+            eviction_threads: Maximum number of cache eviction threads
+            session_max: Maximum number of concurrent sessions (None for
+                WiredTiger's default of 100); raise it for many export workers
+            chunk_cache_path: File in which to cache chunks of the data files
+                read from slow (e.g. network-attached) storage (None to disable)
+            chunk_cache_capacity: Size of the chunk cache file, e.g. "10GB"
+            binary_encoding: How binary values are exported: "hex", or
+                "base64" with a "b64:" prefix (one of BINARY_ENCODINGS)
         """
         self.db_path = Path(db_path)
         self.conn = None
+        self.prefetch = False
+        self.decode_bson = decode_bson
+        self.cache_size = cache_size
+        self.eviction_threads = eviction_threads
+        self.session_max = session_max
+        self.chunk_cache_path = chunk_cache_path
+        self.chunk_cache_capacity = chunk_cache_capacity
+        
+        if decode_bson and bsonjs is None:
+            raise ImportError("Decoding BSON values requires the python-bsonjs package")
+        
+        if binary_encoding not in BINARY_ENCODINGS:
+            raise ValueError(f"Unsupported binary encoding: {binary_encoding}")
+        
+        self.binary_encoding = binary_encoding
+        self._decode_bytes, self._convert_text = BINARY_ENCODINGS[binary_encoding]
+        
+        # Each thread gets a long-lived session with its own cursor cache.
+        # Table scans borrow a session from a pool of idle scan sessions.
+        self._local = threading.local()
+        self._sessions = []
+        self._idle_scan_sessions = []
+        self._sessions_lock = threading.Lock()
+        
+        # Full table scans in progress, and the number of concurrent exports
+        # export_all_tables() is about to start, to share READAHEAD_SIZE
+        self._full_scans = 0
+        self._export_workers = 1
+        self._scans_lock = threading.Lock()
         
         if not self.db_path.exists():
             raise FileNotFoundError(f"Database path does not exist: {db_path}")
@@ -34,45 +397,177 @@ class WiredTigerBrowser:
         """Open connection to the WiredTiger database."""
         try:
             # Open WiredTiger connection in read-only mode
-            config = "readonly=true"
-            self.conn = wiredtiger.wiredtiger_open(str(self.db_path), config)
+            config = self._connection_config()
+            try:
+                self.conn = wiredtiger.wiredtiger_open(
+                    str(self.db_path), f"{config},{PREFETCH_CONNECTION_CONFIG}")
+                self.prefetch = True
+            except wiredtiger.WiredTigerError:
+                # Older WiredTiger releases do not support pre-fetching
+                self.conn = wiredtiger.wiredtiger_open(str(self.db_path), config)
+                self.prefetch = False
             print(f"Successfully opened WiredTiger database at: {self.db_path}")
         except Exception as e:
             raise RuntimeError(f"Failed to open WiredTiger database: {e}")
     
+    def _connection_config(self) -> str:
+        """Build the configuration string used to open the connection."""
+        config = [
+            CONNECTION_CONFIG,
+            f"cache_size={self.cache_size}",
+            f"eviction=(threads_min={min(2, self.eviction_threads)},"
+            f"threads_max={self.eviction_threads})",
+        ]
+        
+        if self.session_max is not None:
+            config.append(f"session_max={self.session_max}")
+        
+        if self.chunk_cache_path is not None:
+            config.append(
+                f"chunk_cache=(enabled=true,type=FILE,capacity={self.chunk_cache_capacity},"
+                f'storage_path="{self.chunk_cache_path}")')
+        
+        return ",".join(config)
+    
     def close(self):
         """Close the WiredTiger connection."""
         if self.conn:
+            # Closing a session also closes every cursor cached on it
+            with self._sessions_lock:
+                for session in self._sessions:
+                    session.close()
+                self._sessions = []
+                self._idle_scan_sessions = []
+            self._local = threading.local()
+            
+            # The catalog is re-read if the browser is opened again
+            self.__dict__.pop("tables", None)
+            
             self.conn.close()
             self.conn = None
+            self.prefetch = False
             print("Database connection closed.")
     
-    def list_tables(self) -> List[str]:
+    def _session(self):
+        """Return the calling thread's session, opening it on first use."""
+        session = getattr(self._local, "session", None)
+        
+        if session is None:
+            session = self.conn.open_session()
+            self._local.session = session
+            self._local.cursors = {}
+            with self._sessions_lock:
+                self._sessions.append(session)
+        
+        return session
+    
+    def _cursor(self, uri: str):
         """
-        List all tables in the WiredTiger database.
+        Return a cursor on the calling thread's session.
+        
+        Cursors are cached by URI and reset before being handed out again,
+        which is cheaper than closing and reopening them on every call.
         
+        Args:
+            uri: WiredTiger URI to open the cursor on
+            
         Returns:
-            List of table names
+            A cursor positioned before the first record
+        """
+        session = self._session()
+        cursor = self._local.cursors.get(uri)
+        
+        if cursor is None:
+            cursor = session.open_cursor(uri, None, None)
+            self._local.cursors[uri] = cursor
+        else:
+            cursor.reset()
+        
+        return cursor
+    
+    @contextmanager
+    def _scan_cursor(self, table_name: str):
+        """
+        Open a cursor for sequentially scanning a table.
+        
+        The cursor is opened on a session borrowed from a pool of scan
+        sessions, which is returned to the pool once the scan is over. A new
+        session is only opened when every pooled one is in use, so repeated
+        and concurrent exports do not each pay for setting one up.
+        
+        Args:
+            table_name: Name of the table to scan
+            
+        Yields:
+            A cursor positioned before the first record
+        """
+        with self._sessions_lock:
+            session = self._idle_scan_sessions.pop() if self._idle_scan_sessions else None
+        
+        if session is None:
+            if self.prefetch:
+                session = self.conn.open_session(PREFETCH_SESSION_CONFIG)
+            else:
+                session = self.conn.open_session()
+            with self._sessions_lock:
+                self._sessions.append(session)
+        
+        try:
+            cursor = session.open_cursor(f"table:{table_name}")
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+        finally:
+            with self._sessions_lock:
+                # Sessions closed by close() in the meantime are not reused
+                if session in self._sessions:
+                    self._idle_scan_sessions.append(session)
+    
+    @cached_property
+    def tables(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Metadata of every table in the database, read once and cached.
+        
+        Returns:
+            Dictionary mapping table names to their metadata
         """
         if not self.conn:
             raise RuntimeError("Database connection not open. Call open() first.")
         
-        tables = []
-        session = self.conn.open_session()
+        tables = {}
+        cursor = self._cursor("metadata:")
         
-        try:
-            cursor = session.open_cursor("metadata:", None, None)
-            
-            for key, value in cursor:
-                if key.startswith("table:"):
-                    table_name = key.split(":", 1)[1]
-                    tables.append(table_name)
+        # Metadata keys are sorted, so all "table:" entries sit together.
+        # Jump straight to them instead of walking the colgroup:, file: and
+        # index: entries, which make up most of a MongoDB catalog.
+        cursor.set_key(TABLE_PREFIX)
+        exact = cursor.search_near()
+        
+        if exact == wiredtiger.WT_NOTFOUND:
+            return tables
+        
+        # search_near may land on the last key before "table:"
+        ret = cursor.next() if exact < 0 else 0
+        
+        while ret == 0:
+            key = cursor.get_key()
+            if not key.startswith(TABLE_PREFIX):
+                break
             
-            cursor.close()
-        finally:
-            session.close()
+            tables[key[TABLE_PREFIX_LEN:]] = {"config": cursor.get_value()}
+            ret = cursor.next()
         
-        return sorted(tables)
+        return tables
+    
+    def list_tables(self) -> List[str]:
+        """
+        List all tables in the WiredTiger database.
+        
+        Returns:
+            List of table names
+        """
+        return list(self.tables)
     
     def get_table_info(self, table_name: str) -> Dict[str, Any]:
         """
@@ -87,7 +582,6 @@ class WiredTigerBrowser:
         if not self.conn:
             raise RuntimeError("Database connection not open. Call open() first.")
         
-        session = self.conn.open_session()
         info = {
             "name": table_name,
             "exists": False,
@@ -95,87 +589,367 @@ class WiredTigerBrowser:
             "record_count": 0
         }
         
-        try:
-            # Check if table exists and get config
-            metadata_cursor = session.open_cursor("metadata:", None, None)
-            metadata_key = f"table:{table_name}"
-            
-            for key, value in metadata_cursor:
-                if key == metadata_key:
-                    info["exists"] = True
-                    info["config"] = value
-                    break
-            
-            metadata_cursor.close()
-            
-            if info["exists"]:
-                # Count records by iterating through cursor
-                # Note: This can be slow for large tables as it must scan all records.
-                # Consider using --limit flag in export commands for large tables.
+        # Check if table exists and get config. Unless the whole catalog has
+        # already been read, look the single entry up instead of reading it.
+        if "tables" in self.__dict__:
+            metadata = self.tables.get(table_name)
+            if metadata is not None:
+                info["exists"] = True
+                info["config"] = metadata["config"]
+        else:
+            cursor = self._cursor("metadata:")
+            cursor.set_key(f"table:{table_name}")
+            if cursor.search() == 0:
+                info["exists"] = True
+                info["config"] = cursor.get_value()
+        
+        if info["exists"]:
+            # Read the number of entries from the table's statistics. The
+            # count is approximate as it may include records that have been
+            # removed but not yet reconciled to disk.
+            try:
+                cursor = self._session().open_cursor(
+                    f"statistics:table:{table_name}", None, RECORD_COUNT_STATISTICS_CONFIG)
                 try:
-                    cursor = session.open_cursor(f"table:{table_name}", None, None)
-                    count = 0
-                    for _ in cursor:
-                        count += 1
-                    info["record_count"] = count
+                    info["record_count"] = cursor[wiredtiger.stat.dsrc.btree_entries][2]
+                    info["record_count_approx"] = True
+                finally:
                     cursor.close()
+            except Exception:
+                # Statistics are unavailable for some tables, e.g. when the
+                # data source does not support them. Fall back to a scan.
+                try:
+                    cursor = self._cursor(f"table:{table_name}")
+                    info["record_count"] = sum(1 for _ in cursor)
                 except Exception as e:
                     info["error"] = f"Could not count records: {e}"
         
+        return info
+    
+    def _data_file(self, table_name: str) -> Optional[Path]:
+        """
+        Find the file a table's records are stored in.
+        
+        The file is named by the source of the table's column group, which
+        need not match the table name, e.g. "file:sub/other.wt" for a table
+        with a single named column group.
+        
+        Args:
+            table_name: Name of the table
+            
+        Returns:
+            Path to the data file, or None if the table is not stored in a
+            single file
+        """
+        cursor = self._cursor("metadata:")
+        cursor.set_key(f"colgroup:{table_name}")
+        
+        if cursor.search() == 0:
+            configs = [cursor.get_value()]
+        else:
+            # Named column groups are listed as "colgroup:<table>:<name>"
+            prefix = f"colgroup:{table_name}:"
+            configs = []
+            cursor.set_key(prefix)
+            exact = cursor.search_near()
+            
+            if exact != wiredtiger.WT_NOTFOUND:
+                # search_near may land on the last key before the prefix
+                ret = cursor.next() if exact < 0 else 0
+                while ret == 0 and cursor.get_key().startswith(prefix):
+                    configs.append(cursor.get_value())
+                    ret = cursor.next()
+        
+        if len(configs) != 1:
+            return None
+        
+        match = _FILE_SOURCE.search(configs[0])
+        if match is None:
+            return None
+        
+        return self.db_path / match.group(1)
+    
+    def _advise_table_file(self, table_name: str, advice: str, length: int = 0):
+        """
+        Pass an access pattern hint for a table's data file to the kernel.
+        
+        Hints are skipped on platforms without posix_fadvise and for tables
+        that are not stored in a single file.
+        
+        Args:
+            table_name: Name of the table
+            advice: Name of an os.POSIX_FADV_* constant, e.g. "POSIX_FADV_WILLNEED"
+            length: Number of bytes the hint applies to (0 for the whole file)
+            
+        Raises:
+            OSError: If the table's data file cannot be opened
+        """
+        if not hasattr(os, "posix_fadvise"):
+            return
+        
+        path = self._data_file(table_name)
+        if path is None:
+            return
+        
+        fd = os.open(path, os.O_RDONLY)
+        
+        try:
+            os.posix_fadvise(fd, 0, length, getattr(os, advice))
+        except OSError:
+            pass
         finally:
-            session.close()
+            os.close(fd)
+    
+    def _data_file_size(self, table_name: str) -> int:
+        """Return the size of a table's data file in bytes, or 0 if it has none."""
+        path = self._data_file(table_name)
+        return os.path.getsize(path) if path is not None else 0
+    
+    @contextmanager
+    def _open_output(self, table_name: str, output_path: str, limit: Optional[int]):
+        """
+        Open an export output file for buffered binary writing.
         
-        return info
+        For full-table exports, disk space is reserved up front so the file
+        does not have to be extended a block at a time while it is written.
+        The table's data file size is used as the estimate. Until it is
+        trimmed, the reserved space reads as NUL bytes, so the export is
+        written under a temporary name ending in PARTIAL_SUFFIX. Once the
+        export succeeds, the file is truncated to the bytes actually written
+        and renamed to output_path; a failed export removes it. Only a killed
+        process leaves the padded temporary file behind. Outputs that exist
+        but are not regular files, such as devices, FIFOs and symlinks, are
+        written in place without reserving space, since renaming a file over
+        them would replace them rather than write to them.
+        
+        Args:
+            table_name: Name of the table being exported
+            output_path: Path to the output file
+            limit: Maximum number of records being exported (None for all)
+            
+        Yields:
+            The open output file
+        """
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        
+        regular_file = not os.path.islink(output_path) and (
+            os.path.isfile(output_path) or not os.path.exists(output_path))
+        estimate = 0 if limit or not regular_file else self._data_file_size(table_name)
+        preallocate = estimate > 0 and hasattr(os, "posix_fallocate")
+        write_path = f"{output_path}{PARTIAL_SUFFIX}" if preallocate else output_path
+        
+        fd = os.open(write_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        
+        try:
+            with os.fdopen(fd, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                if preallocate:
+                    try:
+                        os.posix_fallocate(f.fileno(), 0, estimate)
+                    except OSError:
+                        pass
+                
+                yield f
+                
+                if preallocate:
+                    # Drop whatever part of the reservation was not used
+                    f.truncate()
+        except BaseException:
+            if preallocate:
+                os.unlink(write_path)
+            raise
+        
+        if preallocate:
+            os.replace(write_path, output_path)
     
-    def export_table_to_json(self, table_name: str, output_path: str, limit: Optional[int] = None):
+    def prewarm(self, table_name: str) -> int:
         """
-        Export table data to JSON format.
+        Read every page of a table into the WiredTiger cache.
+        
+        A later export or scan of the table is then served from memory
+        instead of paying for a disk read at each page. Tables larger than
+        the connection's cache are only partly kept.
         
         Args:
-            table_name: Name of the table to export
-            output_path: Path to output JSON file
-            limit: Maximum number of records to export (None for all)
+            table_name: Name of the table to load
+            
+        Returns:
+            Number of records in the table
         """
         if not self.conn:
             raise RuntimeError("Database connection not open. Call open() first.")
         
-        session = self.conn.open_session()
+        # The table's pages are meant to stay cached, so they are not
+        # released from the page cache afterwards
+        with self._full_scan(table_name, release=False), self._scan_cursor(table_name) as cursor:
+            # Step through the records without fetching them into Python
+            count = 0
+            next_record = cursor.next
+            while next_record() == 0:
+                count += 1
+        
+        return count
+    
+    @contextmanager
+    def _full_scan(self, table_name: str, release: bool = True):
+        """
+        Hint the kernel about a full scan of a table's data file while it runs.
+        
+        The beginning of the file is read ahead of the scan. READAHEAD_SIZE
+        is shared with the other full scans in progress, so concurrent
+        exports do not ask for more read-ahead than the page cache can hold.
+        
+        Args:
+            table_name: Name of the table being scanned
+            release: Drop the file from the page cache once the scan is over
+        """
+        with self._scans_lock:
+            self._full_scans += 1
+            scans = max(self._full_scans, self._export_workers)
+        
+        self._advise_table_file(table_name, "POSIX_FADV_WILLNEED", READAHEAD_SIZE // scans)
         
         try:
-            cursor = session.open_cursor(f"table:{table_name}", None, None)
-            records = []
-            count = 0
+            yield
+        finally:
+            with self._scans_lock:
+                self._full_scans -= 1
             
-            for key, value in cursor:
-                record = {
-                    "key": self._serialize_value(key),
-                    "value": self._serialize_value(value)
-                }
-                records.append(record)
-                count += 1
-                
-                if limit and count >= limit:
-                    break
+            # Drop the scanned file from the page cache so exporting a large
+            # backup does not evict everything else.
+            if release:
+                self._advise_table_file(table_name, "POSIX_FADV_DONTNEED")
+    
+    def _iter_batches(self, table_name: str, limit: Optional[int] = None,
+                      raw: bool = False) -> Iterator[List[List[Any]]]:
+        """
+        Iterate over the records of a table in batches of raw key/value pairs.
+        
+        Args:
+            table_name: Name of the table to read
+            limit: Maximum number of records to yield (None for all)
+            raw: Yield keys and values as packed bytes instead of unpacking them
             
-            cursor.close()
+        Yields:
+            Lists of at most BATCH_SIZE [key, value] pairs
+        """
+        if not self.conn:
+            raise RuntimeError("Database connection not open. Call open() first.")
+        
+        # A full scan reads the whole data file, so have the kernel start
+        # reading it ahead of the cursor.
+        with self._full_scan(table_name) if not limit else nullcontext():
+            with self._scan_cursor(table_name) as cursor:
+                # One islice for the whole scan stops at the limit, and stays
+                # exhausted with no limit, without a check in this loop
+                records = islice(_packed_records(cursor) if raw else cursor, limit or None)
+                
+                while True:
+                    batch = _fetch_batch(records)
+                    if batch:
+                        yield batch
+                    
+                    # A WiredTiger cursor starts again at the first record
+                    # once it has returned WT_NOTFOUND, so a short batch is
+                    # the end of the table rather than a cue to ask again.
+                    if len(batch) < BATCH_SIZE:
+                        break
+    
+    def iter_records(self, table_name: str, limit: Optional[int] = None) -> Iterator[Dict[str, str]]:
+        """
+        Iterate over the records of a table without loading them into memory.
+        
+        Args:
+            table_name: Name of the table to read
+            limit: Maximum number of records to yield (None for all)
             
-            # Write to JSON file
-            output_file = Path(output_path)
-            output_file.parent.mkdir(parents=True, exist_ok=True)
+        Yields:
+            Dictionaries with serialized "key" and "value" entries
+        """
+        for batch in self._iter_batches(table_name, limit):
+            serialize = self._serializer_for(batch[0][0])
+            serialize_value = self._value_serializer(batch[0][1])
+            for key, value in batch:
+                yield {"key": serialize(key), "value": serialize_value(value)}
+    
+    def export_table_to_json(self, table_name: str, output_path: str, limit: Optional[int] = None,
+                             progress: Optional[Callable[[int], None]] = None):
+        """
+        Export table data to JSON format.
+        
+        Records are streamed to the output file as they are read, so memory
+        use does not grow with the size of the table.
+        
+        Args:
+            table_name: Name of the table to export
+            output_path: Path to output JSON file
+            limit: Maximum number of records to export (None for all)
+            progress: Called with the number of records written since the
+                last call, at most once every PROGRESS_INTERVAL records
+        """
+        if not self.conn:
+            raise RuntimeError("Database connection not open. Call open() first.")
+        
+        def encode(batch):
+            encode_record = self._record_encoder(*batch[0])
+            return len(batch), b',\n'.join(encode_record(key, value) for key, value in batch)
+        
+        count = 0
+        with self._open_output(table_name, output_path, limit) as f:
+            # The record count is only known once the cursor is exhausted,
+            # so it is written after the records.
+            f.write(b'{"table": ' + _dumps(table_name) + b', "records": [')
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "table": table_name,
-                    "record_count": count,
-                    "records": records
-                }, f, indent=2, ensure_ascii=False)
+            # Batches can be megabytes in size; writing the separator on its
+            # own avoids copying each batch just to prepend it.
+            prefix = b'\n'
+            batches = self._iter_batches(table_name, limit)
+            chunks = _with_progress(_pipeline(batches, encode), progress)
+            with closing(chunks):
+                for n, data in chunks:
+                    f.write(prefix)
+                    f.write(data)
+                    prefix = b',\n'
+                    count += n
             
-            print(f"Exported {count} records from '{table_name}' to {output_path}")
+            f.write(b'\n], "record_count": %d}\n' % count)
         
-        finally:
-            session.close()
+        print(f"Exported {count} records from '{table_name}' to {output_path}")
     
-    def export_table_to_csv(self, table_name: str, output_path: str, limit: Optional[int] = None):
+    def export_table_to_jsonl(self, table_name: str, output_path: str, limit: Optional[int] = None,
+                              progress: Optional[Callable[[int], None]] = None):
+        """
+        Export table data to newline-delimited JSON (JSON Lines) format.
+        
+        Each record is written as a standalone JSON object on its own line,
+        so the output can be consumed incrementally by streaming readers.
+        
+        Args:
+            table_name: Name of the table to export
+            output_path: Path to output JSONL file
+            limit: Maximum number of records to export (None for all)
+            progress: Called with the number of records written since the
+                last call, at most once every PROGRESS_INTERVAL records
+        """
+        if not self.conn:
+            raise RuntimeError("Database connection not open. Call open() first.")
+        
+        def encode(batch):
+            encode_record = self._record_encoder(*batch[0])
+            return len(batch), b''.join(encode_record(key, value) + b'\n' for key, value in batch)
+        
+        count = 0
+        with self._open_output(table_name, output_path, limit) as f:
+            batches = self._iter_batches(table_name, limit)
+            chunks = _with_progress(_pipeline(batches, encode), progress)
+            with closing(chunks):
+                for n, data in chunks:
+                    f.write(data)
+                    count += n
+        
+        print(f"Exported {count} records from '{table_name}' to {output_path}")
+    
+    def export_table_to_csv(self, table_name: str, output_path: str, limit: Optional[int] = None,
+                            progress: Optional[Callable[[int], None]] = None):
         """
         Export table data to CSV format.
         
@@ -183,39 +957,217 @@ class WiredTigerBrowser:
             table_name: Name of the table to export
             output_path: Path to output CSV file
             limit: Maximum number of records to export (None for all)
+            progress: Called with the number of records written since the
+                last call, at most once every PROGRESS_INTERVAL records
         """
         if not self.conn:
             raise RuntimeError("Database connection not open. Call open() first.")
         
-        session = self.conn.open_session()
-        
-        try:
-            cursor = session.open_cursor(f"table:{table_name}", None, None)
+        def encode(batch):
+            serialize = self._serializer_for(batch[0][0])
+            serialize_value = self._value_serializer(batch[0][1])
+            rows = [(serialize(key), serialize_value(value)) for key, value in batch]
             
-            # Prepare output file
-            output_file = Path(output_path)
-            output_file.parent.mkdir(parents=True, exist_ok=True)
+            # Fields only need quoting if they contain a separator, a quote or
+            # a line break. Without any, each row holds exactly one of each
+            # separator, so the batch can be joined without csv.writer.
+            n = len(rows)
+            text = ''.join([key + ',' + value + '\r\n' for key, value in rows])
+            if (text.count(',') != n or text.count('\r') != n or text.count('\n') != n
+                    or '"' in text):
+                buffer = io.StringIO(newline='')
+                csv.writer(buffer).writerows(rows)
+                text = buffer.getvalue()
             
-            with open(output_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['key', 'value'])
-                
-                count = 0
-                for key, value in cursor:
-                    writer.writerow([
-                        self._serialize_value(key),
-                        self._serialize_value(value)
-                    ])
-                    count += 1
-                    
-                    if limit and count >= limit:
-                        break
+            return n, text.encode('utf-8')
+        
+        count = 0
+        with self._open_output(table_name, output_path, limit) as f:
+            f.write(b'key,value\r\n')
             
-            cursor.close()
-            print(f"Exported {count} records from '{table_name}' to {output_path}")
+            batches = self._iter_batches(table_name, limit)
+            chunks = _with_progress(_pipeline(batches, encode), progress)
+            with closing(chunks):
+                for n, data in chunks:
+                    f.write(data)
+                    count += n
         
+        print(f"Exported {count} records from '{table_name}' to {output_path}")
+    
+    def export_table_to_raw(self, table_name: str, output_path: str, limit: Optional[int] = None,
+                            progress: Optional[Callable[[int], None]] = None):
+        """
+        Export table data as a binary dump of the stored keys and values.
+        
+        Keys and values are written in the packed form described by the
+        table's key_format and value_format, as the cursor reads them before
+        unpacking, without being decoded or serialized. Each record is
+        written as a little-endian 32-bit key length, the key, a 32-bit
+        value length and the value.
+        
+        Args:
+            table_name: Name of the table to export
+            output_path: Path to output file
+            limit: Maximum number of records to export (None for all)
+            progress: Called with the number of records written since the
+                last call, at most once every PROGRESS_INTERVAL records
+        """
+        if not self.conn:
+            raise RuntimeError("Database connection not open. Call open() first.")
+        
+        pack_length = _RAW_LENGTH.pack
+        
+        def encode(batch):
+            return len(batch), b''.join(
+                pack_length(len(key)) + key + pack_length(len(value)) + value
+                for key, value in batch
+            )
+        
+        count = 0
+        with self._open_output(table_name, output_path, limit) as f:
+            batches = self._iter_batches(table_name, limit, raw=True)
+            chunks = _with_progress(_pipeline(batches, encode), progress)
+            with closing(chunks):
+                for n, data in chunks:
+                    f.write(data)
+                    count += n
+        
+        print(f"Exported {count} records from '{table_name}' to {output_path}")
+    
+    def export_table(self, table_name: str, output_path: str, format: str = "json",
+                     limit: Optional[int] = None, progress: Optional[Callable[[int], None]] = None):
+        """
+        Export table data in the given format.
+        
+        Args:
+            table_name: Name of the table to export
+            output_path: Path to output file
+            format: One of EXPORT_FORMATS
+            limit: Maximum number of records to export (None for all)
+            progress: Called with the number of records written since the
+                last call, at most once every PROGRESS_INTERVAL records
+        """
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {format}")
+        
+        export = getattr(self, f"export_table_to_{format}")
+        export(table_name, output_path, limit, progress)
+    
+    def export_all_tables(self, output_dir: str, format: str = "json", limit: Optional[int] = None,
+                          workers: Optional[int] = None, tables: Optional[List[str]] = None,
+                          on_complete: Optional[Callable[[str, Path, Optional[Exception]], None]] = None
+                          ) -> Dict[str, Optional[Exception]]:
+        """
+        Export tables concurrently, each to "<table>.<format>" in a directory.
+        
+        Tables are exported over the shared read-only connection by a pool of
+        threads; each export scans its table in its own WiredTiger session.
+        A table that fails to export does not stop the others.
+        
+        Args:
+            output_dir: Directory to write the exported files to
+            format: One of EXPORT_FORMATS
+            limit: Maximum number of records to export per table (None for all)
+            workers: Number of tables to export at once (default: number of CPUs)
+            tables: Names of the tables to export (None for all)
+            on_complete: Called in the calling thread with the table name,
+                output file and exception (None on success) as each table finishes
+            
+        Returns:
+            Dictionary mapping each table name to the exception that made its
+            export fail, or None if it was exported
+        """
+        if not self.conn:
+            raise RuntimeError("Database connection not open. Call open() first.")
+        
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {format}")
+        
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        
+        if tables is None:
+            tables = self.list_tables()
+        workers = workers or os.cpu_count()
+        
+        # The exports start at once, so each gets its share of the read-ahead
+        # window from the start rather than the first ones taking all of it
+        self._export_workers = max(1, min(workers, len(tables)))
+        
+        results = {}
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {}
+                for table in tables:
+                    output_file = output_path / f"{table}.{format}"
+                    future = executor.submit(self.export_table, table, str(output_file), format, limit)
+                    futures[future] = (table, output_file)
+                
+                for future in as_completed(futures):
+                    table, output_file = futures[future]
+                    error = future.exception()
+                    results[table] = error
+                    if on_complete is not None:
+                        on_complete(table, output_file, error)
         finally:
-            session.close()
+            self._export_workers = 1
+        
+        return results
+    
+    def _value_serializer(self, sample: Any) -> Callable[[Any], str]:
+        """Return the function used to convert table values like sample to strings."""
+        serialize = self._serializer_for(sample)
+        
+        if not self.decode_bson:
+            return serialize
+        
+        def serialize_value(value):
+            document = _bson_to_json(value)
+            return serialize(value) if document is None else document
+        
+        return serialize_value
+    
+    def _record_encoder(self, key: Any, value: Any) -> Callable[[Any, Any], bytes]:
+        """Return the function used to encode records like (key, value) as JSON objects."""
+        serialize_key = self._serializer_for(key)
+        serialize_value = self._serializer_for(value)
+        
+        def encode_record(key, value):
+            return _dumps({"key": serialize_key(key), "value": serialize_value(value)})
+        
+        if not self.decode_bson:
+            return encode_record
+        
+        def encode_bson_record(key, value):
+            document = _bson_to_json(value)
+            if document is None:
+                return encode_record(key, value)
+            # The decoded document is already JSON, so it is spliced in as-is
+            return b'{"key":' + _dumps(serialize_key(key)) + b',"value":' + document.encode('utf-8') + b'}'
+        
+        return encode_bson_record
+    
+    def _serializer_for(self, sample: Any) -> Callable[[Any], str]:
+        """
+        Return a function serializing values of the same type as sample.
+        
+        The key and value formats of a WiredTiger table are fixed, so all of
+        its keys, and all of its values, share a type. Picking the conversion
+        once per batch saves repeating the checks in _serialize_value for
+        every record.
+        
+        Args:
+            sample: A key or value read from the table
+            
+        Returns:
+            Function with the same result as _serialize_value for such values
+        """
+        if isinstance(sample, (bytes, bytearray)):
+            return self._decode_bytes
+        if isinstance(sample, str):
+            return self._convert_text
+        # Integers and composite (tuple) values are passed to str()
+        return str
     
     def _serialize_value(self, value: Any) -> str:
         """
@@ -228,12 +1180,9 @@ class WiredTigerBrowser:
             String representation of the value
         """
         if isinstance(value, (bytes, bytearray)):
-            try:
-                # Try to decode as UTF-8
-                return value.decode('utf-8')
-            except UnicodeDecodeError:
-                # If that fails, return hex representation
-                return value.hex()
+            return self._decode_bytes(value)
+        elif isinstance(value, str):
+            return self._convert_text(value)
         elif isinstance(value, tuple):
             # For composite values, join with separator
             return str(value)